@@ -0,0 +1,135 @@
+import asyncio
+import os
+import uvicorn
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Body, HTTPException
+
+from google.adk.sessions import DatabaseSessionService, InMemorySessionService, Session
+from google.adk.runners import Runner
+from google.genai.types import Content, Part
+from financial_advisor import root_agent as finance_agent
+
+# --- Configuration ---
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+APP_NAME = "finance_advisor_app"
+# Opt-in so local reloads don't pay for an LLM round-trip on every restart
+WARMUP_ENABLED = os.getenv("AGENT_WARMUP", "0") == "1"
+WARMUP_TIMEOUT_SECONDS = 30
+# Shared session store so any worker can serve any session; in-memory otherwise
+SESSION_DB_URL = os.getenv("SESSION_DB_URL")
+
+session_service = (
+    DatabaseSessionService(db_url=SESSION_DB_URL) if SESSION_DB_URL else InMemorySessionService()
+)
+
+# Built once so requests reuse the same agent graph instead of rebuilding it
+runner = Runner(
+    agent=finance_agent,
+    app_name=APP_NAME,
+    session_service=session_service
+)
+
+
+async def get_or_create_session(app_name: str, user_id: str, session_id: str) -> Session:
+    """Fetch a session, creating it only if it doesn't exist yet (it persists in a shared store)."""
+    session = await session_service.get_session(app_name=app_name, user_id=user_id, session_id=session_id)
+    if session is not None:
+        return session
+    try:
+        return await session_service.create_session(app_name=app_name, user_id=user_id, session_id=session_id)
+    except Exception:
+        # Another request or worker may have created it between the lookup and the insert
+        session = await session_service.get_session(app_name=app_name, user_id=user_id, session_id=session_id)
+        if session is None:
+            raise
+        return session
+
+
+async def warm_up_agent():
+    """Run a throwaway request so the first real /chat hits a warm model connection."""
+    user_id = "_warmup"
+    session = None
+    try:
+        # Unique id per run so workers sharing a session store don't collide
+        session = await session_service.create_session(app_name=APP_NAME, user_id=user_id)
+        events = runner.run_async(
+            user_id=user_id,
+            session_id=session.id,
+            new_message=Content(role="user", parts=[Part(text="ping")])
+        )
+        try:
+            await asyncio.wait_for(events.__anext__(), timeout=WARMUP_TIMEOUT_SECONDS)
+        finally:
+            await events.aclose()
+        logger.info("Agent warm-up complete")
+    except Exception as e:
+        logger.warning("Agent warm-up failed: %s", e)
+    finally:
+        # Don't leave warm-up sessions behind in a persistent store, even on failure
+        if session is not None:
+            try:
+                await session_service.delete_session(app_name=APP_NAME, user_id=user_id, session_id=session.id)
+            except Exception as e:
+                logger.warning("Failed to delete warm-up session: %s", e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan management"""
+    if WARMUP_ENABLED:
+        await warm_up_agent()
+    yield
+
+
+# --- FastAPI App ---
+app = FastAPI(
+    title="Financial Advisor API",
+    version="1.0.0",
+    lifespan=lifespan,
+)
+
+# --- Endpoint ---
+@app.post("/chat")
+async def chat(user_message: str) -> dict:
+    """Get a response from the finance advisor agent."""
+    try:
+        app_name, user_id, session_id = APP_NAME, "user1", "session1"
+
+        session = await get_or_create_session(app_name, user_id, session_id)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("Chat request started - User: %s, Session: %s, Initial state: %s",
+                         user_id, session_id, session.state)
+        user_message = Content(role="User", parts=[Part(text=user_message)])
+        # run_async keeps the event loop free while the agent waits on the model
+        async for event in runner.run_async(user_id=user_id,
+                                            session_id=session_id,
+                                            new_message=user_message):
+            # --- Check Updated State ---
+            if debug:
+                updated_session = await session_service.get_session(app_name=app_name, user_id=user_id, session_id=session_id)
+                logger.debug("State after agent run: %s, Event text: %s",
+                             updated_session.state, event.content.parts[0].text)
+        return {"response": event.content.parts[0].text}
+    except Exception as e:
+        logger.error("Chat error: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+# --- Server Startup ---
+if __name__ == "__main__":
+    if os.getenv("DEV"):
+        uvicorn.run("adk_api:app", host="0.0.0.0", port=8000, reload=True)
+    else:
+        # In-memory sessions are per process, so keep one worker unless SESSION_DB_URL is set
+        uvicorn.run(
+            "adk_api:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+            loop="uvloop",
+            http="httptools",
+            log_level="warning"
+        )
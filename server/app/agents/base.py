@@ -65,11 +65,15 @@ class BaseAgent(ABC):
     
     async def initialize(self, context: AgentContext):
         """Initialize agent with context"""
+        self.bind_context(context)
+        await self._on_initialize()
+    
+    def bind_context(self, context: AgentContext):
+        """Attach context and reset run state without re-running initialization hooks"""
         self.context = context
         self.status = AgentStatus.IDLE
         self.current_iteration = 0
         self.start_time = None
-        await self._on_initialize()
     
     async def _on_initialize(self):
         """Override in subclasses for custom initialization"""
@@ -3,12 +3,12 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from typing import Optional
 from jose import jwt
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import logging
 
 from app.core.config import settings
 from app.core.database import get_db
-from app.models.user import User, UserSession
+from app.models.user import User, UserSession, verify_dummy_password
 
 logger = logging.getLogger(__name__)
 
@@ -94,6 +94,8 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     """Authenticate user with email and password"""
     user = db.query(User).filter(User.email == email).first()
     if not user:
+        # Spend the same bcrypt time as a wrong password so unknown emails aren't revealed
+        verify_dummy_password(password)
         return None
     if not user.verify_password(password):
         return None
@@ -109,14 +111,14 @@ def create_user_session(
     """Create a new user session"""
     
     # Calculate expiration
-    expires_at = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
     
     session = UserSession(
         user_id=user_id,
         session_token=token,
         user_agent=user_agent,
         ip_address=ip_address,
-        expires_at=expires_at.isoformat(),
+        expires_at=expires_at,
         is_active=True
     )
     
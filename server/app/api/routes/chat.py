@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
@@ -33,7 +34,14 @@ class ConversationHistoryResponse(BaseModel):
     conversations: List[Dict[str, Any]]
     total_count: int
 
-@router.post("/message", response_model=ChatResponse)
+# The response is built locally, so skip response_model re-validation;
+# ChatResponse is kept for the OpenAPI schema only
+@router.post(
+    "/message",
+    response_class=ORJSONResponse,
+    response_model=None,
+    responses={200: {"model": ChatResponse}}
+)
 async def send_message(
     chat_message: ChatMessage,
     background_tasks: BackgroundTasks,
@@ -92,13 +100,13 @@ async def send_message(
             response.agent_id
         )
         
-        return ChatResponse(
-            response=response.content,
-            agent_used=response.agent_id or "unknown",
-            metadata=response.metadata,
-            conversation_id=conversation_id,
-            session_id=session_id
-        )
+        return ORJSONResponse({
+            "response": response.content,
+            "agent_used": response.agent_id or "unknown",
+            "metadata": response.metadata,
+            "conversation_id": conversation_id,
+            "session_id": session_id
+        })
         
     except Exception as e:
         logger.error(f"Error processing chat message: {e}", exc_info=True)
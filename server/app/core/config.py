@@ -17,6 +17,7 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     api_prefix: str = "/api/v1"
+    api_workers: Optional[int] = None  # Defaults to a single worker
     
     # Security
     secret_key: str = "your-secret-key-change-in-production"
@@ -49,6 +50,7 @@ class Settings(BaseSettings):
     # Tool settings
     web_search_api_key: Optional[str] = None
     financial_data_api_key: Optional[str] = None
+    mock_search_delay: float = 0.0  # Simulated latency (seconds) for the mock search engine
     
     # CORS settings
     allowed_origins: List[str] = ["http://localhost:3000", "http://localhost:8080", "http://localhost:8501"]
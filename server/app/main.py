@@ -2,17 +2,44 @@ from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
+import logging.handlers
+import queue
 
 from app.core.config import settings
 from app.core.database import create_tables
 from app.api.routes import chat, tools
 from app.services.orchestration.agent_manager import AgentManager
+from app.tools.base import close_shared_session
 
-# Configure logging
+# Configure logging: while the app is serving, request handlers only enqueue
+# records and a background listener thread performs the blocking writes to
+# stdout; outside the lifespan records are written directly
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+)
+_queue_handler = logging.handlers.QueueHandler(log_queue)
+log_listener = logging.handlers.QueueListener(log_queue, _stream_handler, respect_handler_level=True)
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    handlers=[_stream_handler]
 )
+
+def start_queue_logging():
+    """Route root log records through the queue listener"""
+    root = logging.getLogger()
+    log_listener.start()
+    root.addHandler(_queue_handler)
+    root.removeHandler(_stream_handler)
+
+def stop_queue_logging():
+    """Flush queued records and go back to writing log records directly"""
+    root = logging.getLogger()
+    root.addHandler(_stream_handler)
+    root.removeHandler(_queue_handler)
+    log_listener.stop()
+
 logger = logging.getLogger(__name__)
 
 # Global agent manager instance
@@ -22,6 +49,7 @@ agent_manager: AgentManager = None
 async def lifespan(app: FastAPI):
     """Application lifespan management"""
     # Startup
+    start_queue_logging()
     logger.info("Starting CoAgentics AI System...")
     
     try:
@@ -39,6 +67,7 @@ async def lifespan(app: FastAPI):
         
     except Exception as e:
         logger.error(f"Failed to start application: {e}")
+        stop_queue_logging()
         raise
     
     yield
@@ -48,9 +77,13 @@ async def lifespan(app: FastAPI):
     try:
         if agent_manager:
             await agent_manager.shutdown()
+        await close_shared_session()
         logger.info("CoAgentics AI System shutdown complete")
     except Exception as e:
         logger.error(f"Error during shutdown: {e}")
+    finally:
+        # Flush queued records; anything logged after this is written directly
+        stop_queue_logging()
 
 # Create FastAPI application
 app = FastAPI(
@@ -1,12 +1,16 @@
 from sqlalchemy import Column, Integer, DateTime, String, Boolean, Text
 from sqlalchemy.sql import func
 from sqlalchemy.ext.declarative import declared_attr
-from datetime import datetime
 from typing import Any, Dict
-import json
+import re
+import orjson
 
 from app.core.database import Base
 
+# CamelCase -> snake_case for table names, memoized per class name
+_CAMEL_CASE_RE = re.compile(r'(.)([A-Z][a-z]+)')
+_TABLE_NAME_CACHE: Dict[str, str] = {}
+
 class TimestampMixin:
     """Mixin to add timestamp fields to models"""
     
@@ -23,22 +27,19 @@ class BaseModel(Base, TimestampMixin):
     @declared_attr
     def __tablename__(cls):
         # Convert CamelCase to snake_case for table names
-        import re
-        return re.sub('(.)([A-Z][a-z]+)', r'\1_\2', cls.__name__).lower()
+        name = cls.__name__
+        table_name = _TABLE_NAME_CACHE.get(name)
+        if table_name is None:
+            table_name = _TABLE_NAME_CACHE[name] = _CAMEL_CASE_RE.sub(r'\1_\2', name).lower()
+        return table_name
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert model instance to dictionary"""
-        result = {}
-        for column in self.__table__.columns:
-            value = getattr(self, column.name)
-            if isinstance(value, datetime):
-                value = value.isoformat()
-            result[column.name] = value
-        return result
+        """Convert model instance to dictionary (datetimes are left as datetime objects)"""
+        return {name: getattr(self, name) for name in self.__table__.columns.keys()}
     
     def to_json(self) -> str:
         """Convert model instance to JSON string"""
-        return json.dumps(self.to_dict(), default=str)
+        return orjson.dumps(self.to_dict(), default=str, option=orjson.OPT_NAIVE_UTC).decode()
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]):
@@ -1,12 +1,122 @@
-from sqlalchemy import Column, String, Boolean, Text, JSON
+import asyncio
+import hashlib
+import hmac
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import bcrypt
+from sqlalchemy import Column, String, Boolean, Text, JSON, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
-from passlib.context import CryptContext
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 from .base import BaseModel, SoftDeleteMixin
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+
+# Binary JSONB on Postgres (decoded once, indexable); plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+# Password hashing settings (same cost factor passlib used by default)
+BCRYPT_ROUNDS = 12
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+def hash_password(password: str) -> str:
+    """Hash a password with bcrypt"""
+    secret = password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
+    return bcrypt.hashpw(secret, bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("ascii")
+
+def check_password(password: str, hashed_password: str) -> bool:
+    """Check a password against a bcrypt hash"""
+    secret = password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
+    return bcrypt.checkpw(secret, hashed_password.encode("ascii"))
+
+# Short-lived cache of verification results so repeat checks of the same
+# credential skip bcrypt. Failures expire quickly to keep guessing expensive.
+VERIFY_CACHE_TTL_SECONDS = 30.0
+VERIFY_CACHE_FAILURE_TTL_SECONDS = 1.0
+VERIFY_CACHE_MAX_SIZE = 1024
+
+# Hash checked instead when there's no usable one (missing account, non-bcrypt hash),
+# so those paths cost a real cost-12 bcrypt check and time like a wrong password.
+# Built on first use to keep imports fast.
+_dummy_hash: Optional[str] = None
+_dummy_hash_lock = threading.Lock()
+
+def verify_dummy_password(password: str) -> bool:
+    """Spend a full bcrypt check against a throwaway hash; always returns False"""
+    global _dummy_hash
+    if _dummy_hash is None:
+        with _dummy_hash_lock:
+            if _dummy_hash is None:
+                _dummy_hash = hash_password(secrets.token_urlsafe(16))
+    check_password(password, _dummy_hash)
+    return False
+
+# Random per-process HMAC key for cache keys, so cached digests can't be cracked offline
+_VERIFY_CACHE_KEY_SECRET = secrets.token_bytes(32)
+_verify_cache: "OrderedDict[Tuple[str, bytes], Tuple[bool, float]]" = OrderedDict()
+_verify_cache_lock = threading.Lock()
+
+# Session expiry doesn't need sub-10ms precision, so reuse one "now" value
+# across checks: [utc datetime, monotonic time it was taken]
+APPROX_NOW_REFRESH_SECONDS = 0.01
+_now_cache = [datetime.now(timezone.utc), time.monotonic()]
+
+def _approx_now() -> datetime:
+    """Current UTC time, at most APPROX_NOW_REFRESH_SECONDS stale"""
+    if time.monotonic() - _now_cache[1] > APPROX_NOW_REFRESH_SECONDS:
+        _now_cache[0] = datetime.now(timezone.utc)
+        _now_cache[1] = time.monotonic()
+    return _now_cache[0]
+
+def _is_bcrypt_hash(hashed_password: Optional[str]) -> bool:
+    """Check that a stored value looks like a bcrypt hash before running bcrypt"""
+    return bool(hashed_password) and hashed_password.startswith("$2")
+
+def _verify_cache_key(password: str, hashed_password: str) -> Tuple[str, bytes]:
+    """Build a cache key without keeping the plaintext password (or a crackable digest of it) in memory"""
+    return hashed_password, hmac.new(_VERIFY_CACHE_KEY_SECRET, password.encode("utf-8"), hashlib.sha256).digest()
+
+def _get_cached_verification(key: Tuple[str, bytes]) -> Optional[bool]:
+    """Return a cached verification result, or None if missing or expired"""
+    with _verify_cache_lock:
+        entry = _verify_cache.get(key)
+        if entry is None:
+            return None
+        result, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del _verify_cache[key]
+            return None
+        return result
+
+def _cache_verification(key: Tuple[str, bytes], result: bool):
+    """Store a verification result, evicting the oldest entries past the size cap"""
+    ttl = VERIFY_CACHE_TTL_SECONDS if result else VERIFY_CACHE_FAILURE_TTL_SECONDS
+    with _verify_cache_lock:
+        _verify_cache[key] = (result, time.monotonic() + ttl)
+        _verify_cache.move_to_end(key)
+        while len(_verify_cache) > VERIFY_CACHE_MAX_SIZE:
+            _verify_cache.popitem(last=False)
+
+# Sync methods already warned about being called on an event loop (logged once each)
+_loop_warned_methods = set()
+
+def _warn_if_running_loop(method_name: str):
+    """Point callers at the async variant when blocking bcrypt runs on an event loop"""
+    if method_name in _loop_warned_methods:
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    _loop_warned_methods.add(method_name)
+    logger.warning(
+        f"User.{method_name} blocks the event loop; consider 'await User.{method_name}_async' instead"
+    )
 
 class User(BaseModel, SoftDeleteMixin):
     """User model for authentication and profile management"""
@@ -19,7 +129,7 @@ class User(BaseModel, SoftDeleteMixin):
     is_superuser = Column(Boolean, default=False, nullable=False)
     
     # Profile information
-    preferences = Column(JSON, nullable=True)  # User preferences as JSON
+    preferences = Column(JSONType, nullable=True)  # User preferences as JSON
     profile_data = Column(Text, nullable=True)  # Additional profile data
     
     # Financial profile
@@ -29,11 +139,37 @@ class User(BaseModel, SoftDeleteMixin):
     
     def set_password(self, password: str):
         """Hash and set password"""
-        self.hashed_password = pwd_context.hash(password)
+        _warn_if_running_loop("set_password")
+        self.hashed_password = hash_password(password)
     
     def verify_password(self, password: str) -> bool:
         """Verify password against hash"""
-        return pwd_context.verify(password, self.hashed_password)
+        _warn_if_running_loop("verify_password")
+        if not _is_bcrypt_hash(self.hashed_password):
+            return verify_dummy_password(password)
+        key = _verify_cache_key(password, self.hashed_password)
+        cached = _get_cached_verification(key)
+        if cached is not None:
+            return cached
+        result = check_password(password, self.hashed_password)
+        _cache_verification(key, result)
+        return result
+    
+    async def set_password_async(self, password: str):
+        """Hash and set password in a worker thread so the event loop stays free"""
+        self.hashed_password = await asyncio.to_thread(hash_password, password)
+    
+    async def verify_password_async(self, password: str) -> bool:
+        """Verify password against hash in a worker thread so the event loop stays free"""
+        if not _is_bcrypt_hash(self.hashed_password):
+            return await asyncio.to_thread(verify_dummy_password, password)
+        key = _verify_cache_key(password, self.hashed_password)
+        cached = _get_cached_verification(key)
+        if cached is not None:
+            return cached
+        result = await asyncio.to_thread(check_password, password, self.hashed_password)
+        _cache_verification(key, result)
+        return result
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary, excluding sensitive data"""
@@ -50,34 +186,46 @@ class UserSession(BaseModel):
     user_agent = Column(Text, nullable=True)
     ip_address = Column(String(45), nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
-    expires_at = Column(String(255), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
     
     # Session context
-    session_data = Column(JSON, nullable=True)  # Store session-specific data
+    session_data = Column(JSONType, nullable=True)  # Store session-specific data
     
     def is_expired(self) -> bool:
         """Check if session is expired"""
-        from datetime import datetime
-        try:
-            expires_at = datetime.fromisoformat(self.expires_at.replace('Z', '+00:00'))
-            return datetime.utcnow() > expires_at.replace(tzinfo=None)
-        except:
+        expires_at = self.expires_at
+        if expires_at is None:
             return True
+        # SQLite drops tzinfo on read; stored values are always UTC
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return _approx_now() >= expires_at
     
     def extend_session(self, minutes: int = 30):
         """Extend session expiration"""
-        from datetime import datetime, timedelta
-        new_expiry = datetime.utcnow() + timedelta(minutes=minutes)
-        self.expires_at = new_expiry.isoformat()
+        self.expires_at = datetime.now(timezone.utc) + timedelta(minutes=minutes)
 
 class ConversationHistory(BaseModel):
     """Store conversation history for context"""
     
-    user_id = Column(String(255), nullable=False, index=True)
-    session_id = Column(String(255), nullable=False, index=True)
+    # History is always read as "latest N messages" for a user or a user's
+    # session, so index in that order and let the DB skip the sort
+    __table_args__ = (
+        Index('ix_conv_user_session_created', 'user_id', 'session_id', 'created_at'),
+        Index('ix_conv_user_created', 'user_id', 'created_at'),
+        Index(
+            'ix_conv_extra_data_gin',
+            'extra_data',
+            postgresql_using='gin',
+            postgresql_ops={'extra_data': 'jsonb_path_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
+    
+    user_id = Column(String(255), nullable=False)
+    session_id = Column(String(255), nullable=False)
     message_type = Column(String(50), nullable=False)  # user, assistant, system
     content = Column(Text, nullable=False)
-    extra_data = Column(JSON, nullable=True)  # Store additional context
+    extra_data = Column(JSONType, nullable=True)  # Store additional context
     
     # Agent information
     agent_type = Column(String(100), nullable=True)  # Which agent processed this
@@ -1,6 +1,8 @@
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 from app.agents.base import BaseAgent, AgentContext, AgentMessage
@@ -8,10 +10,20 @@ from app.agents.planning.master_planner import MasterPlannerAgent
 from app.agents.financial.financial_assistant import FinancialAssistant
 from app.tools.web_search.web_search_tool import WebSearchTool
 from app.tools.financial_calc.calculator import FinancialCalculatorTool
+from app.utils import DATACLASS_SLOTS
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Cap on concurrent can_handle checks, since classifiers may call external services
+MAX_CONCURRENT_CAN_HANDLE = 8
+
+# How long cached status payloads may be served for fields that change at runtime
+STATUS_CACHE_TTL_SECONDS = 0.5
+
+# Upper bound on remembered (agent, session) initializations
+MAX_INITIALIZED_SESSIONS = 10000
+
+@dataclass(**DATACLASS_SLOTS)
 class AgentRegistration:
     """Agent registration information"""
     agent: BaseAgent
@@ -26,9 +38,19 @@ class AgentManager:
     
     def __init__(self):
         self.agents: Dict[str, AgentRegistration] = {}
+        # Enabled agent IDs by priority, rebuilt only when registrations change
+        self._priority_order: List[str] = []
         self.tools: Dict[str, Any] = {}
         self.master_planner: Optional[MasterPlannerAgent] = None
         self._initialized = False
+        self._can_handle_semaphore = asyncio.Semaphore(MAX_CONCURRENT_CAN_HANDLE)
+        
+        # Status payloads keyed by name: (version, built_at, payload)
+        self._status_version = 0
+        self._status_cache: Dict[str, Tuple[int, float, Any]] = {}
+        
+        # "agent_id:session_id" keys whose initialization hooks already ran (LRU order)
+        self._initialized_sessions: "OrderedDict[str, None]" = OrderedDict()
         
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
     
@@ -58,15 +80,15 @@ class AgentManager:
         """Initialize all tools"""
         
         # Web Search Tool
-        web_search_tool = WebSearchTool(search_engine="mock")  # Use mock for development
-        await web_search_tool.initialize()
-        self.tools["web_search"] = web_search_tool
+        self.tools["web_search"] = WebSearchTool(search_engine="mock")  # Use mock for development
         
         # Financial Calculator Tool
-        calculator_tool = FinancialCalculatorTool()
-        await calculator_tool.initialize()
-        self.tools["financial_calculator"] = calculator_tool
+        self.tools["financial_calculator"] = FinancialCalculatorTool()
+        
+        # Tool initializations are independent, so run them concurrently
+        await asyncio.gather(*(tool.initialize() for tool in self.tools.values()))
         
+        self._invalidate_status_cache()
         self.logger.info(f"Initialized {len(self.tools)} tools")
     
     async def _register_agents(self):
@@ -98,6 +120,7 @@ class AgentManager:
         for tool_name, tool in self.tools.items():
             self.master_planner.register_tool(tool_name, tool)
         
+        self._invalidate_status_cache()
         self.logger.info("Master planner initialized and configured")
     
     def register_agent(self, agent: BaseAgent, priority: int = 5, enabled: bool = True):
@@ -109,8 +132,34 @@ class AgentManager:
         )
         
         self.agents[agent.agent_id] = registration
+        self._rebuild_priority_order()
         self.logger.info(f"Registered agent: {agent.name} (ID: {agent.agent_id})")
     
+    def _rebuild_priority_order(self):
+        """Recompute enabled agent IDs sorted by priority (lower number = higher priority)"""
+        self._priority_order = sorted(
+            (agent_id for agent_id, registration in self.agents.items() if registration.enabled),
+            key=lambda agent_id: self.agents[agent_id].priority
+        )
+        self._invalidate_status_cache()
+    
+    def _invalidate_status_cache(self):
+        """Mark cached status payloads as stale after agents or tools change"""
+        self._status_version += 1
+    
+    def _get_cached_status(self, key: str, builder: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Return a cached status payload, rebuilding it if stale or older than ttl"""
+        now = time.monotonic()
+        cached = self._status_cache.get(key)
+        if cached is not None:
+            version, built_at, payload = cached
+            if version == self._status_version and (ttl is None or now - built_at < ttl):
+                return payload
+        
+        payload = builder()
+        self._status_cache[key] = (self._status_version, now, payload)
+        return payload
+    
     def get_agent(self, agent_id: str) -> Optional[BaseAgent]:
         """Get an agent by ID"""
         registration = self.agents.get(agent_id)
@@ -120,12 +169,14 @@ class AgentManager:
         """Enable an agent"""
         if agent_id in self.agents:
             self.agents[agent_id].enabled = True
+            self._rebuild_priority_order()
             self.logger.info(f"Enabled agent: {agent_id}")
     
     def disable_agent(self, agent_id: str):
         """Disable an agent"""
         if agent_id in self.agents:
             self.agents[agent_id].enabled = False
+            self._rebuild_priority_order()
             self.logger.info(f"Disabled agent: {agent_id}")
     
     async def process_message(self, message: str, context: AgentContext) -> AgentMessage:
@@ -137,14 +188,14 @@ class AgentManager:
         try:
             # If master planner is available, use it for orchestration
             if self.master_planner:
-                await self.master_planner.initialize(context)
+                await self._prepare_agent(self.master_planner, context)
                 response = await self.master_planner.execute(message)
                 return response
             
             # Fallback: Find the best single agent
             best_agent = await self._find_best_agent(message, context)
             if best_agent:
-                await best_agent.initialize(context)
+                await self._prepare_agent(best_agent, context)
                 response = await best_agent.execute(message)
                 return response
             
@@ -163,33 +214,59 @@ class AgentManager:
                 metadata={"error": str(e)}
             )
     
+    async def _prepare_agent(self, agent: BaseAgent, context: AgentContext):
+        """Initialize an agent once per session; later messages only rebind the context"""
+        key = f"{agent.agent_id}:{context.session_id}"
+        if key in self._initialized_sessions:
+            self._initialized_sessions.move_to_end(key)
+            agent.bind_context(context)
+            return
+        
+        await agent.initialize(context)
+        self._initialized_sessions[key] = None
+        while len(self._initialized_sessions) > MAX_INITIALIZED_SESSIONS:
+            self._initialized_sessions.popitem(last=False)
+    
     async def _find_best_agent(self, message: str, context: AgentContext) -> Optional[BaseAgent]:
         """Find the best agent to handle a message"""
         
-        suitable_agents = []
+        # Snapshot the priority order, since registrations may change while awaiting
+        candidates = [self.agents[agent_id] for agent_id in self._priority_order]
         
-        # Check which agents can handle the message
-        for agent_id, registration in self.agents.items():
-            if not registration.enabled:
-                continue
-            
+        # Check which agents can handle the message concurrently
+        results = await asyncio.gather(*(
+            self._safe_can_handle(registration.agent.agent_id, registration.agent, message, context)
+            for registration in candidates
+        ))
+        
+        # Candidates are already in priority order, so the first match wins
+        for registration, can_handle in zip(candidates, results):
+            if can_handle:
+                return registration.agent
+        
+        return None
+    
+    async def _safe_can_handle(
+        self,
+        agent_id: str,
+        agent: BaseAgent,
+        message: str,
+        context: AgentContext
+    ) -> bool:
+        """Check if an agent can handle a message, treating errors as a no"""
+        async with self._can_handle_semaphore:
             try:
-                can_handle = await registration.agent.can_handle(message, context)
-                if can_handle:
-                    suitable_agents.append((registration.agent, registration.priority))
+                return await agent.can_handle(message, context)
             except Exception as e:
                 self.logger.warning(f"Error checking if agent {agent_id} can handle message: {e}")
-        
-        if not suitable_agents:
-            return None
-        
-        # Sort by priority (lower number = higher priority)
-        suitable_agents.sort(key=lambda x: x[1])
-        
-        return suitable_agents[0][0]
+                return False
     
     def get_all_agent_status(self) -> List[Dict[str, Any]]:
         """Get status of all registered agents"""
+        return self._get_cached_status("agents", self._build_agent_status, STATUS_CACHE_TTL_SECONDS)
+    
+    def _build_agent_status(self) -> List[Dict[str, Any]]:
+        """Build the status list for all registered agents"""
         status_list = []
         
         for agent_id, registration in self.agents.items():
@@ -216,6 +293,10 @@ class AgentManager:
     
     def get_tools_status(self) -> Dict[str, Any]:
         """Get status of all tools"""
+        return self._get_cached_status("tools", self._build_tools_status, STATUS_CACHE_TTL_SECONDS)
+    
+    def _build_tools_status(self) -> Dict[str, Any]:
+        """Build the status map for all tools"""
         tools_status = {}
         
         for tool_name, tool in self.tools.items():
@@ -230,6 +311,10 @@ class AgentManager:
     
     async def health_check(self) -> Dict[str, Any]:
         """Perform health check on all agents and tools"""
+        return self._get_cached_status("health", self._build_health_status, STATUS_CACHE_TTL_SECONDS)
+    
+    def _build_health_status(self) -> Dict[str, Any]:
+        """Build the health check payload for all agents and tools"""
         
         health_status = {
             "agent_manager": "healthy",
@@ -291,4 +376,6 @@ class AgentManager:
                 self.logger.warning(f"Error resetting agent {agent_id}: {e}")
         
         self._initialized = False
+        self._initialized_sessions.clear()
+        self._invalidate_status_cache()
         self.logger.info("Agent Manager shutdown complete") 
\ No newline at end of file
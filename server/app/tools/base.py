@@ -1,13 +1,108 @@
 import asyncio
+import copy
+import hashlib
 import logging
+import threading
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
-from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, Union
+from dataclasses import dataclass, field, replace
 import time
 
+import orjson
+from cachetools import TTLCache
+
+from app.utils import DATACLASS_SLOTS
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Parameter values that can be used directly as part of a cache key
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+# Sentinel for cache lookups, since None is a valid cached result
+_MISSING = object()
+
+# Event loop kept per thread for synchronous tool execution
+_loop_local = threading.local()
+
+def _get_thread_loop() -> asyncio.AbstractEventLoop:
+    """Get this thread's reusable event loop, creating it if needed"""
+    loop = getattr(_loop_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _loop_local.loop = loop
+    return loop
+
+# Shared in-flight work, keyed by (event loop, key) since a task can only be awaited on its own loop
+_inflight_tasks: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task] = {}
+
+def _finish_inflight(inflight_key: Tuple[asyncio.AbstractEventLoop, Hashable], task: asyncio.Task):
+    """Drop a finished in-flight task, retrieving its exception in case every waiter went away"""
+    _inflight_tasks.pop(inflight_key, None)
+    if not task.cancelled():
+        task.exception()
+
+async def run_single_flight(key: Hashable, work: Callable[[], Awaitable[Any]]) -> Any:
+    """Await the shared task for key, starting work() if none is running.
+    
+    The work runs as its own task, so a cancelled caller doesn't cancel it for the others.
+    """
+    loop = asyncio.get_running_loop()
+    inflight_key = (loop, key)
+    task = _inflight_tasks.get(inflight_key)
+    if task is None:
+        task = loop.create_task(work())
+        _inflight_tasks[inflight_key] = task
+        task.add_done_callback(lambda done: _finish_inflight(inflight_key, done))
+    return await asyncio.shield(task)
+
+# Computation results shared by every instance of a tool, keyed by tool_id, since
+# routes create a new tool per request
+_computation_caches: Dict[str, TTLCache] = {}
+_computation_caches_lock = threading.Lock()
+
+# HTTP sessions shared by all API-based tools so connections, TLS sessions and
+# DNS lookups are reused across tools and calls. A session is bound to the loop it
+# was created on, so there is one per event loop.
+_shared_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+def _orjson_dumps(obj: Any) -> str:
+    """JSON serializer for aiohttp request bodies"""
+    return orjson.dumps(obj).decode()
+
+async def get_shared_session():
+    """Get the shared aiohttp session for the running event loop, creating it on first use"""
+    import aiohttp
+    
+    loop = asyncio.get_running_loop()
+    session = _shared_sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=200,
+            limit_per_host=32,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+        session = aiohttp.ClientSession(connector=connector, json_serialize=_orjson_dumps)
+        _shared_sessions[loop] = session
+    return session
+
+async def close_shared_session():
+    """Close the shared aiohttp sessions of every event loop - call once on application shutdown"""
+    current_loop = asyncio.get_running_loop()
+    for loop, session in list(_shared_sessions.items()):
+        if session.closed or loop.is_closed():
+            continue
+        if loop is current_loop:
+            await session.close()
+        elif loop.is_running():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+        else:
+            # Idle per-thread loop from execute(); drive it from a worker thread
+            await asyncio.to_thread(loop.run_until_complete, session.close())
+    _shared_sessions.clear()
+
+@dataclass(**DATACLASS_SLOTS)
 class ToolResult:
     """Standardized result format for tool execution"""
     success: bool
@@ -36,6 +131,7 @@ class BaseTool(ABC):
         
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self._initialized = False
+        self._schema: Optional[Dict[str, Any]] = None
     
     async def initialize(self) -> bool:
         """Initialize the tool - override in subclasses"""
@@ -57,7 +153,7 @@ class BaseTool(ABC):
         if not self._initialized:
             await self.initialize()
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # Execute with timeout
@@ -66,12 +162,11 @@ class BaseTool(ABC):
                 timeout=self.timeout_seconds
             )
             
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             
             if isinstance(result, ToolResult):
-                result.execution_time = execution_time
-                result.tool_name = self.name
-                return result
+                # Copy rather than mutate, since cached results are shared between callers
+                return replace(result, execution_time=execution_time, tool_name=self.name)
             else:
                 # Convert result to ToolResult
                 return ToolResult(
@@ -82,7 +177,7 @@ class BaseTool(ABC):
                 )
                 
         except asyncio.TimeoutError:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             error_msg = f"Tool {self.name} timed out after {self.timeout_seconds} seconds"
             self.logger.error(error_msg)
             return ToolResult(
@@ -92,7 +187,7 @@ class BaseTool(ABC):
                 tool_name=self.name
             )
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             error_msg = f"Tool {self.name} error: {str(e)}"
             self.logger.error(error_msg, exc_info=True)
             return ToolResult(
@@ -104,7 +199,16 @@ class BaseTool(ABC):
     
     def execute(self, **kwargs) -> ToolResult:
         """Synchronous execution wrapper"""
-        return asyncio.run(self.execute_async(**kwargs))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop running in this thread - reuse the thread's loop instead
+            # of building a new one per call
+            return _get_thread_loop().run_until_complete(self.execute_async(**kwargs))
+        raise RuntimeError(
+            f"Tool {self.name}: execute() cannot be called from a running event loop; "
+            "use 'await execute_async()' instead"
+        )
     
     @abstractmethod
     async def _execute_internal(self, **kwargs) -> Union[Any, ToolResult]:
@@ -113,14 +217,17 @@ class BaseTool(ABC):
     
     def get_schema(self) -> Dict[str, Any]:
         """Get tool schema for documentation and validation"""
-        return {
-            "tool_id": self.tool_id,
-            "name": self.name,
-            "description": self.description,
-            "version": self.version,
-            "parameters": self._get_parameters_schema(),
-            "return_type": self._get_return_schema()
-        }
+        # Schemas are static, so build once on first use (after subclass setup)
+        if self._schema is None:
+            self._schema = {
+                "tool_id": self.tool_id,
+                "name": self.name,
+                "description": self.description,
+                "version": self.version,
+                "parameters": self._get_parameters_schema(),
+                "return_type": self._get_return_schema()
+            }
+        return self._schema
     
     def _get_parameters_schema(self) -> Dict[str, Any]:
         """Override in subclasses to define parameter schema"""
@@ -156,8 +263,7 @@ class APIBasedTool(BaseTool):
     
     async def _initialize_internal(self):
         """Initialize API session"""
-        import aiohttp
-        self._session = aiohttp.ClientSession()
+        self._session = await get_shared_session()
         
         # Test API connection if test endpoint available
         if hasattr(self, '_test_connection'):
@@ -167,10 +273,16 @@ class APIBasedTool(BaseTool):
         """Override in subclasses to test API connection"""
         pass
     
-    async def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Make HTTP request with error handling"""
+    async def _get_session(self):
+        """Get the shared session for the running event loop, which may differ from the one at initialize"""
         if not self._session:
             raise RuntimeError("Tool not properly initialized - session not available")
+        self._session = await get_shared_session()
+        return self._session
+    
+    async def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """Make HTTP request with error handling"""
+        session = await self._get_session()
         
         url = f"{self.base_url}/{endpoint.lstrip('/')}" if self.base_url else endpoint
         
@@ -180,46 +292,74 @@ class APIBasedTool(BaseTool):
             headers['Authorization'] = f"Bearer {self.api_key}"
         kwargs['headers'] = headers
         
-        async with self._session.request(method, url, **kwargs) as response:
+        async with session.request(method, url, **kwargs) as response:
             response.raise_for_status()
             return await response.json()
     
     async def cleanup(self):
-        """Cleanup resources"""
-        if self._session:
-            await self._session.close()
+        """Cleanup resources (the shared session is closed by close_shared_session)"""
+        self._session = None
 
 class ComputationTool(BaseTool):
-    """Base class for tools that perform computations"""
+    """Base class for tools that perform computations
+    
+    Results are cached per tool_id and shared by every instance, so cache_size and
+    cache_ttl must be the same for all instances of a tool.
+    """
     
-    def __init__(self, *args, **kwargs):
+    def __init__(
+        self,
+        *args,
+        cache_enabled: bool = True,
+        cache_size: int = 1024,
+        cache_ttl: float = 3600,
+        **kwargs
+    ):
         super().__init__(*args, **kwargs)
-        self.cache_enabled = kwargs.get('cache_enabled', True)
-        self._cache: Dict[str, Any] = {}
+        self.cache_enabled = cache_enabled
+        with _computation_caches_lock:
+            cache = _computation_caches.get(self.tool_id)
+            if cache is None:
+                cache = _computation_caches[self.tool_id] = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+            elif (cache.maxsize, cache.ttl) != (cache_size, cache_ttl):
+                # The cache is shared per tool_id, so later instances can't resize it
+                raise ValueError(
+                    f"Cache for {self.tool_id} already exists with cache_size={cache.maxsize}, "
+                    f"cache_ttl={cache.ttl}; got cache_size={cache_size}, cache_ttl={cache_ttl}"
+                )
+        self._cache: TTLCache = cache
     
-    def _get_cache_key(self, **kwargs) -> str:
+    def _get_cache_key(self, **kwargs) -> Hashable:
         """Generate cache key from parameters"""
-        import hashlib
-        import json
+        # Flat scalar parameters are already hashable - skip serialization
+        if all(isinstance(value, _SCALAR_TYPES) for value in kwargs.values()):
+            return tuple(sorted(kwargs.items()))
         
         # Sort parameters for consistent hashing
-        sorted_params = json.dumps(kwargs, sort_keys=True)
-        return hashlib.md5(sorted_params.encode()).hexdigest()
+        sorted_params = orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        return hashlib.blake2b(sorted_params, digest_size=16).hexdigest()
     
     async def _execute_internal(self, **kwargs) -> Union[Any, ToolResult]:
         """Execute with caching support"""
-        if self.cache_enabled:
-            cache_key = self._get_cache_key(**kwargs)
-            if cache_key in self._cache:
-                self.logger.debug(f"Cache hit for {self.name}")
-                return self._cache[cache_key]
+        if not self.cache_enabled:
+            return await self._compute(**kwargs)
         
-        result = await self._compute(**kwargs)
+        cache_key = self._get_cache_key(**kwargs)
+        with _computation_caches_lock:
+            cached = self._cache.get(cache_key, _MISSING)
+        if cached is not _MISSING:
+            self.logger.debug(f"Cache hit for {self.name}")
+            # Callers may mutate the result, so never hand out the cached object
+            return copy.deepcopy(cached)
         
-        if self.cache_enabled and cache_key:
-            self._cache[cache_key] = result
+        async def compute_and_cache():
+            result = await self._compute(**kwargs)
+            with _computation_caches_lock:
+                self._cache[cache_key] = result
+            return result
         
-        return result
+        # Concurrent callers with the same key share a single computation, each getting its own copy
+        return copy.deepcopy(await run_single_flight((self.tool_id, cache_key), compute_and_cache))
     
     @abstractmethod
     async def _compute(self, **kwargs) -> Union[Any, ToolResult]:
@@ -228,5 +368,6 @@ class ComputationTool(BaseTool):
     
     def clear_cache(self):
         """Clear the computation cache"""
-        self._cache.clear()
+        with _computation_caches_lock:
+            self._cache.clear()
         self.logger.info(f"Cache cleared for {self.name}") 
\ No newline at end of file
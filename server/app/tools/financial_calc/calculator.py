@@ -1,10 +1,56 @@
 import math
-from typing import Dict, Any, Optional, Union, List
+from typing import TYPE_CHECKING, Dict, Any, Optional, Tuple, Union, List
 from dataclasses import dataclass
-import numpy as np
 
 from app.tools.base import ComputationTool, ToolResult
 
+if TYPE_CHECKING:
+    import numpy as np
+
+# Upper bound on Monte Carlo trajectories per request, and on the number of simulated
+# months held in memory at once (~8MB of float64)
+MAX_MONTE_CARLO_SIMULATIONS = 20000
+MONTE_CARLO_BLOCK_SIZE = 1_000_000
+
+# NumPy is imported on first use so processes that never calculate don't pay for it
+_np = None
+
+def _numpy():
+    """Import NumPy lazily and return the module"""
+    global _np
+    if _np is None:
+        import numpy
+        _np = numpy
+    return _np
+
+def _amortize(loan_amount: float, monthly_rate: float, payment: float, max_payments: int):
+    """Closed-form payoff of a fixed-payment loan, returning (payments made, total interest)"""
+    growth = 1 + monthly_rate
+    
+    def balance_after(k: int) -> float:
+        if monthly_rate > 0:
+            factor = growth ** k
+            return loan_amount * factor - payment * (factor - 1) / monthly_rate
+        return loan_amount - payment * k
+    
+    # Months until the balance reaches zero: n = log(P / (P - rL)) / log(1 + r)
+    if payment > monthly_rate * loan_amount and payment > 0:
+        if monthly_rate > 0:
+            months = math.log(payment / (payment - monthly_rate * loan_amount)) / math.log1p(monthly_rate)
+        else:
+            months = loan_amount / payment
+        payments_made = max(1, math.ceil(months - 1e-9))
+    else:
+        payments_made = math.inf
+    
+    if payments_made > max_payments:
+        # Never paid off within the cap: interest is whatever principal didn't absorb
+        return max_payments, payment * max_payments - loan_amount + balance_after(max_payments)
+    
+    # Final payment clears the remaining balance plus its interest
+    final_payment = balance_after(payments_made - 1) * growth
+    return payments_made, payment * (payments_made - 1) + final_payment - loan_amount
+
 @dataclass
 class FinancialCalculationResult:
     """Result of a financial calculation"""
@@ -14,6 +60,19 @@ class FinancialCalculationResult:
     explanation: str
     assumptions: List[str]
 
+def _safe_div(numerator: float, denominator: float, default: float = 0.0) -> float:
+    """Divide, returning default instead of raising when the denominator is zero"""
+    return numerator / denominator if denominator else default
+
+def _correlation(correlations: Dict[str, Dict[str, float]], asset_a: str, asset_b: str) -> float:
+    """Look up a pairwise correlation in either direction (1.0 on the diagonal, 0.0 if missing)"""
+    if asset_a == asset_b:
+        return correlations.get(asset_a, {}).get(asset_b, 1.0)
+    value = correlations.get(asset_a, {}).get(asset_b)
+    if value is None:
+        value = correlations.get(asset_b, {}).get(asset_a, 0.0)
+    return value
+
 class FinancialCalculatorTool(ComputationTool):
     """
     Financial Calculator Tool for various financial computations
@@ -35,10 +94,16 @@ class FinancialCalculatorTool(ComputationTool):
                 result = self._calculate_compound_interest(**kwargs)
             elif calculation_type == "retirement_savings":
                 result = self._calculate_retirement_savings(**kwargs)
+            elif calculation_type == "retirement_monte_carlo":
+                result = self._calculate_retirement_monte_carlo(**kwargs)
             elif calculation_type == "loan_payment":
                 result = self._calculate_loan_payment(**kwargs)
+            elif calculation_type == "loan_payment_sweep":
+                result = self._calculate_loan_payment_sweep(**kwargs)
             elif calculation_type == "portfolio_return":
                 result = self._calculate_portfolio_return(**kwargs)
+            elif calculation_type == "optimize_portfolio":
+                result = self._calculate_optimal_portfolio(**kwargs)
             elif calculation_type == "risk_metrics":
                 result = self._calculate_risk_metrics(**kwargs)
             elif calculation_type == "asset_allocation":
@@ -78,24 +143,27 @@ class FinancialCalculatorTool(ComputationTool):
         compounds_per_year: int = 12
     ) -> FinancialCalculationResult:
         """Calculate compound interest"""
+        np = _numpy()
         
         # Convert percentage to decimal if needed
         if annual_rate > 1:
             annual_rate = annual_rate / 100
         
-        # Calculate compound interest
-        amount = principal * (1 + annual_rate / compounds_per_year) ** (compounds_per_year * years)
+        # Calculate compound interest; the per-period growth factor is shared by every term below
+        base = 1 + annual_rate / compounds_per_year
+        amount = principal * base ** (compounds_per_year * years)
         interest_earned = amount - principal
         
-        # Calculate year-by-year breakdown
-        yearly_breakdown = []
-        for year in range(1, years + 1):
-            year_amount = principal * (1 + annual_rate / compounds_per_year) ** (compounds_per_year * year)
-            yearly_breakdown.append({
-                "year": year,
-                "balance": round(year_amount, 2),
-                "interest_earned": round(year_amount - principal, 2)
-            })
+        # Calculate year-by-year breakdown in one vectorized pass
+        exponents = compounds_per_year * np.arange(1, years + 1)
+        balances = principal * np.power(base, exponents)
+        # Quantize to cents in one ufunc pass; tolist() yields plain Python floats
+        rounded_balances = (np.rint(balances * 100) / 100).tolist()
+        rounded_interest = (np.rint((balances - principal) * 100) / 100).tolist()
+        yearly_breakdown = [
+            {"year": year, "balance": balance, "interest_earned": interest}
+            for year, balance, interest in zip(range(1, years + 1), rounded_balances, rounded_interest)
+        ]
         
         return FinancialCalculationResult(
             calculation_type="compound_interest",
@@ -108,7 +176,7 @@ class FinancialCalculatorTool(ComputationTool):
             result={
                 "final_amount": round(amount, 2),
                 "total_interest": round(interest_earned, 2),
-                "effective_annual_rate": round(((amount / principal) ** (1/years) - 1) * 100, 2),
+                "effective_annual_rate": round((base ** compounds_per_year - 1) * 100, 2),
                 "yearly_breakdown": yearly_breakdown
             },
             explanation=f"With compound interest, ${principal:,.2f} grows to ${amount:,.2f} over {years} years at {annual_rate*100:.1f}% annual rate.",
@@ -139,12 +207,12 @@ class FinancialCalculatorTool(ComputationTool):
         months_to_retirement = years_to_retirement * 12
         
         # Future value of current savings
-        fv_current = current_savings * (1 + annual_return) ** years_to_retirement
+        fv_current = current_savings * math.exp(years_to_retirement * math.log1p(annual_return))
         
-        # Future value of monthly contributions
+        # Future value of monthly contributions (expm1/log1p stay accurate for small rates)
         if monthly_return > 0:
             fv_contributions = monthly_contribution * (
-                ((1 + monthly_return) ** months_to_retirement - 1) / monthly_return
+                math.expm1(months_to_retirement * math.log1p(monthly_return)) / monthly_return
             )
         else:
             fv_contributions = monthly_contribution * months_to_retirement
@@ -187,6 +255,95 @@ class FinancialCalculatorTool(ComputationTool):
             ]
         )
     
+    def _calculate_retirement_monte_carlo(
+        self,
+        current_age: int,
+        retirement_age: int,
+        current_savings: float,
+        monthly_contribution: float,
+        annual_return: float,
+        annual_volatility: float = 15,
+        n_simulations: int = 5000,
+        desired_monthly_income: Optional[float] = None,
+        seed: Optional[int] = None
+    ) -> FinancialCalculationResult:
+        """Simulate the distribution of retirement savings under random monthly returns"""
+        np = _numpy()
+        
+        if annual_return > 1:
+            annual_return = annual_return / 100
+        if annual_volatility > 1:
+            annual_volatility = annual_volatility / 100
+        
+        months_to_retirement = (retirement_age - current_age) * 12
+        if months_to_retirement <= 0:
+            raise ValueError("Retirement age must be greater than current age")
+        if not 0 < n_simulations <= MAX_MONTE_CARLO_SIMULATIONS:
+            raise ValueError(f"n_simulations must be between 1 and {MAX_MONTE_CARLO_SIMULATIONS}")
+        
+        # Simulate trajectories in blocks of rows so memory stays bounded; drawing
+        # row blocks in order yields the same samples as one full-size draw
+        rng = np.random.default_rng(seed)
+        final_growth = np.empty(n_simulations)
+        inverse_growth_sum = np.empty(n_simulations)
+        rows_per_block = max(1, MONTE_CARLO_BLOCK_SIZE // months_to_retirement)
+        for start in range(0, n_simulations, rows_per_block):
+            stop = min(start + rows_per_block, n_simulations)
+            growth = rng.normal(
+                annual_return / 12,
+                annual_volatility / math.sqrt(12),
+                size=(stop - start, months_to_retirement)
+            )
+            growth += 1
+            np.cumprod(growth, axis=1, out=growth)
+            final_growth[start:stop] = growth[:, -1]
+            inverse_growth_sum[start:stop] = np.reciprocal(growth, out=growth).sum(axis=1)
+        
+        # End-of-month contributions: deposit t grows by final_growth / growth[t]
+        fv_current = current_savings * final_growth
+        fv_contributions = monthly_contribution * final_growth * inverse_growth_sum
+        terminal_savings = fv_current + fv_contributions
+        
+        p10, p50, p90 = np.percentile(terminal_savings, [10, 50, 90])
+        
+        # Probability that the 4% rule covers the desired income
+        success_probability = None
+        if desired_monthly_income:
+            monthly_withdrawal = terminal_savings * 0.04 / 12
+            success_probability = float(np.mean(monthly_withdrawal >= desired_monthly_income)) * 100
+        
+        return FinancialCalculationResult(
+            calculation_type="retirement_monte_carlo",
+            inputs={
+                "current_age": current_age,
+                "retirement_age": retirement_age,
+                "current_savings": current_savings,
+                "monthly_contribution": monthly_contribution,
+                "annual_return": annual_return * 100,
+                "annual_volatility": annual_volatility * 100,
+                "n_simulations": n_simulations
+            },
+            result={
+                "median_retirement_savings": round(float(p50), 2),
+                "percentile_10": round(float(p10), 2),
+                "percentile_90": round(float(p90), 2),
+                "mean_retirement_savings": round(float(terminal_savings.mean()), 2),
+                "median_monthly_withdrawal_4_percent": round(float(p50) * 0.04 / 12, 2),
+                "success_probability_percent": round(success_probability, 1) if success_probability is not None else None
+            },
+            explanation=(
+                f"Across {n_simulations:,} simulated markets, savings at age {retirement_age} range from "
+                f"${p10:,.2f} (10th percentile) to ${p90:,.2f} (90th percentile), with a median of ${p50:,.2f}."
+            ),
+            assumptions=[
+                f"Monthly returns normally distributed: {annual_return*100:.1f}% mean, {annual_volatility*100:.1f}% annual volatility",
+                "Returns independent from month to month",
+                "Contributions made at the end of each month",
+                "4% safe withdrawal rate in retirement",
+                "Inflation not adjusted"
+            ]
+        )
+    
     def _calculate_loan_payment(
         self,
         loan_amount: float,
@@ -213,18 +370,10 @@ class FinancialCalculatorTool(ComputationTool):
         # Calculate with extra payments
         total_monthly = monthly_payment + extra_payment
         
-        # Simulate payoff with extra payments
-        balance = loan_amount
-        payments_made = 0
-        total_interest = 0
-        
-        while balance > 0.01 and payments_made < num_payments * 2:  # Safety cap
-            interest_payment = balance * monthly_rate
-            principal_payment = min(total_monthly - interest_payment, balance)
-            
-            balance -= principal_payment
-            total_interest += interest_payment
-            payments_made += 1
+        # Payoff with extra payments
+        payments_made, total_interest = _amortize(
+            loan_amount, monthly_rate, total_monthly, num_payments * 2  # Safety cap
+        )
         
         months_saved = num_payments - payments_made
         years_saved = months_saved / 12
@@ -257,6 +406,126 @@ class FinancialCalculatorTool(ComputationTool):
             ]
         )
     
+    def _calculate_loan_payment_batch(
+        self,
+        loan_amount: float,
+        annual_rate: float,
+        loan_term_years: int,
+        extra_payments: "np.ndarray"
+    ) -> Dict[str, Union[float, "np.ndarray"]]:
+        """Evaluate loan payoff for many extra-payment amounts at once, returning parallel arrays
+        (plus the scenario-independent base monthly payment as a scalar)"""
+        np = _numpy()
+        
+        if annual_rate > 1:
+            annual_rate = annual_rate / 100
+        
+        monthly_rate = annual_rate / 12
+        num_payments = loan_term_years * 12
+        max_payments = num_payments * 2  # Safety cap
+        
+        if monthly_rate > 0:
+            growth_total = (1 + monthly_rate) ** num_payments
+            monthly_payment = loan_amount * monthly_rate * growth_total / (growth_total - 1)
+        else:
+            monthly_payment = loan_amount / num_payments
+        
+        total_monthly = monthly_payment + np.asarray(extra_payments, dtype=np.float64)
+        growth = 1 + monthly_rate
+        
+        def balance_after(k: np.ndarray) -> np.ndarray:
+            if monthly_rate > 0:
+                factor = np.power(growth, k)
+                return loan_amount * factor - total_monthly * (factor - 1) / monthly_rate
+            return loan_amount - total_monthly * k
+        
+        # Same closed form as _amortize, evaluated for every scenario together
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pays_off = (total_monthly > monthly_rate * loan_amount) & (total_monthly > 0)
+            if monthly_rate > 0:
+                months = np.log(total_monthly / (total_monthly - monthly_rate * loan_amount)) / math.log1p(monthly_rate)
+            else:
+                months = loan_amount / total_monthly
+            months = np.where(pays_off, months, np.inf)
+        payments_made = np.maximum(1, np.ceil(months - 1e-9))
+        capped = payments_made > max_payments
+        payments_made = np.where(capped, max_payments, payments_made)
+        
+        final_payment = balance_after(payments_made - 1) * growth
+        total_interest = np.where(
+            capped,
+            total_monthly * max_payments - loan_amount + balance_after(payments_made),
+            total_monthly * (payments_made - 1) + final_payment - loan_amount
+        )
+        
+        # Payment counts are whole months, matching the ints from the scalar loan_payment
+        payments_made = payments_made.astype(np.int64)
+        
+        return {
+            "monthly_payment": float(monthly_payment),
+            "total_monthly": total_monthly,
+            "months_to_payoff": payments_made,
+            "months_saved": num_payments - payments_made,
+            "total_interest": total_interest,
+            "interest_saved": (monthly_payment * num_payments - loan_amount) - total_interest
+        }
+    
+    def _calculate_loan_payment_sweep(
+        self,
+        loan_amount: float,
+        annual_rate: float,
+        loan_term_years: int,
+        extra_payments: List[float]
+    ) -> FinancialCalculationResult:
+        """Compare loan payoff across a range of extra monthly payments"""
+        np = _numpy()
+        
+        batch = self._calculate_loan_payment_batch(
+            loan_amount, annual_rate, loan_term_years, np.asarray(extra_payments, dtype=np.float64)
+        )
+        
+        # Convert to per-scenario dicts only at the result boundary
+        rounded = {
+            key: (np.rint(batch[key] * 100) / 100).tolist()
+            for key in ("total_monthly", "total_interest", "interest_saved")
+        }
+        scenarios = [
+            {
+                "extra_payment": extra,
+                "total_monthly": total_monthly,
+                "total_interest": total_interest,
+                "interest_saved": interest_saved,
+                "months_saved": months_saved,
+                "payoff_time_years": round(months / 12, 1)
+            }
+            for extra, total_monthly, total_interest, interest_saved, months_saved, months in zip(
+                extra_payments, rounded["total_monthly"], rounded["total_interest"],
+                rounded["interest_saved"], batch["months_saved"].tolist(), batch["months_to_payoff"].tolist()
+            )
+        ]
+        monthly_payment = batch["monthly_payment"]
+        
+        return FinancialCalculationResult(
+            calculation_type="loan_payment_sweep",
+            inputs={
+                "loan_amount": loan_amount,
+                "annual_rate": annual_rate * 100 if annual_rate <= 1 else annual_rate,
+                "loan_term_years": loan_term_years,
+                "extra_payments": list(extra_payments)
+            },
+            result={
+                "monthly_payment": round(monthly_payment, 2),
+                "scenarios": scenarios
+            },
+            explanation=f"Compared {len(scenarios)} extra-payment scenarios on a ${loan_amount:,.2f} loan with a ${monthly_payment:,.2f} base monthly payment.",
+            assumptions=[
+                "Fixed interest rate",
+                "No prepayment penalties",
+                "Extra payments applied to principal",
+                "Consistent payment schedule"
+            ]
+        )
+    
     def _calculate_portfolio_return(
         self,
         allocations: Dict[str, float],
@@ -265,6 +534,7 @@ class FinancialCalculatorTool(ComputationTool):
         correlations: Optional[Dict[str, Dict[str, float]]] = None
     ) -> FinancialCalculationResult:
         """Calculate portfolio expected return and risk"""
+        np = _numpy()
         
         # Ensure allocations sum to 100%
         total_allocation = sum(allocations.values())
@@ -275,17 +545,20 @@ class FinancialCalculatorTool(ComputationTool):
         if total_allocation > 1.5:
             allocations = {k: v/100 for k, v in allocations.items()}
         
-        # Calculate expected portfolio return
-        portfolio_return = sum(
-            allocations[asset] * expected_returns[asset] for asset in allocations
-        )
+        # Convert the keyed inputs to positional arrays once; the math below never touches the dicts
+        assets = list(allocations)
+        weights = np.fromiter((allocations[a] for a in assets), dtype=np.float64, count=len(assets))
+        returns = np.fromiter((expected_returns[a] for a in assets), dtype=np.float64, count=len(assets))
+        vols = np.fromiter((volatilities[a] for a in assets), dtype=np.float64, count=len(assets))
+        correlation_matrix = None
+        if correlations:
+            correlation_matrix = np.array([
+                [_correlation(correlations, a, b) for b in assets] for a in assets
+            ])
         
-        # Calculate portfolio variance (simplified - assumes uncorrelated if no correlation matrix)
-        portfolio_variance = sum(
-            (allocations[asset] ** 2) * (volatilities[asset] ** 2) for asset in allocations
+        portfolio_return, portfolio_volatility = self._calculate_portfolio_return_arrays(
+            weights, returns, vols, correlation_matrix
         )
-        
-        portfolio_volatility = math.sqrt(portfolio_variance)
         sharpe_ratio = portfolio_return / portfolio_volatility if portfolio_volatility > 0 else 0
         
         return FinancialCalculationResult(
@@ -293,7 +566,8 @@ class FinancialCalculatorTool(ComputationTool):
             inputs={
                 "allocations": allocations,
                 "expected_returns": expected_returns,
-                "volatilities": volatilities
+                "volatilities": volatilities,
+                "correlations": correlations
             },
             result={
                 "expected_annual_return": round(portfolio_return * 100, 2),
@@ -310,6 +584,154 @@ class FinancialCalculatorTool(ComputationTool):
             ]
         )
     
+    def _calculate_portfolio_return_arrays(
+        self,
+        weights: "np.ndarray",
+        returns: "np.ndarray",
+        vols: "np.ndarray",
+        correlation_matrix: Optional["np.ndarray"] = None
+    ) -> Tuple[float, float]:
+        """Calculate portfolio expected return and volatility from positionally aligned arrays"""
+        
+        # Calculate expected portfolio return
+        portfolio_return = float(weights @ returns)
+        
+        # Calculate portfolio variance: w' Σ w with Σ[i,j] = ρ_ij σ_i σ_j (uncorrelated if no matrix)
+        if correlation_matrix is not None:
+            covariance = correlation_matrix * _numpy().outer(vols, vols)
+            portfolio_variance = float(weights @ covariance @ weights)
+        else:
+            portfolio_variance = float((weights * weights) @ (vols * vols))
+        
+        # Clamp rounding noise from perfectly hedged positions before the square root
+        return portfolio_return, math.sqrt(max(portfolio_variance, 0.0))
+    
+    def _calculate_optimal_portfolio(
+        self,
+        expected_returns: Dict[str, float],
+        volatilities: Dict[str, float],
+        correlations: Optional[Dict[str, Dict[str, float]]] = None,
+        objective: str = "max_sharpe",
+        target_return: Optional[float] = None,
+        risk_free_rate: float = 0.0
+    ) -> FinancialCalculationResult:
+        """Solve for long-only mean-variance optimal weights (max Sharpe or min variance)"""
+        np = _numpy()
+        from scipy.optimize import minimize
+        
+        if objective not in ("max_sharpe", "min_variance"):
+            raise ValueError(f"Unknown optimization objective: {objective}")
+        
+        assets = list(expected_returns)
+        n = len(assets)
+        if n == 0:
+            raise ValueError("At least one asset is required")
+        if set(volatilities) != set(assets):
+            missing = sorted(set(assets) - set(volatilities))
+            extra = sorted(set(volatilities) - set(assets))
+            raise ValueError(
+                f"volatilities must cover exactly the assets in expected_returns (missing: {missing}, unexpected: {extra})"
+            )
+        for asset_a, row in (correlations or {}).items():
+            for asset_b, value in row.items():
+                if asset_a not in expected_returns or asset_b not in expected_returns:
+                    raise ValueError(f"Correlation given for unknown asset pair: {asset_a}/{asset_b}")
+                if not -1.0 <= value <= 1.0:
+                    raise ValueError(f"Correlation {asset_a}/{asset_b} must be between -1 and 1, got {value}")
+        
+        returns = np.fromiter((expected_returns[a] for a in assets), dtype=np.float64, count=n)
+        vols = np.fromiter((volatilities[a] for a in assets), dtype=np.float64, count=n)
+        if not (np.all(np.isfinite(returns)) and np.all(np.isfinite(vols))):
+            raise ValueError("Expected returns and volatilities must be finite numbers")
+        if np.any(vols < 0):
+            raise ValueError("Volatilities must be non-negative")
+        correlation_matrix = np.array([
+            [_correlation(correlations or {}, a, b) for b in assets] for a in assets
+        ])
+        # Pairwise-valid correlations can still be jointly impossible
+        if np.linalg.eigvalsh(correlation_matrix).min() < -1e-10:
+            raise ValueError("Correlations are inconsistent: the correlation matrix is not positive semi-definite")
+        covariance = correlation_matrix * np.outer(vols, vols)
+        
+        # A long-only, fully invested portfolio can only earn between the lowest and highest asset return
+        if target_return is not None and not returns.min() - 1e-12 <= target_return <= returns.max() + 1e-12:
+            raise ValueError(
+                f"target_return {target_return} is not achievable; it must be between {returns.min()} and {returns.max()}"
+            )
+        
+        bounds = [(0.0, 1.0)] * n
+        constraints = [{"type": "eq", "fun": lambda w: w.sum() - 1, "jac": lambda w: np.ones(n)}]
+        if target_return is not None:
+            constraints.append({"type": "eq", "fun": lambda w: w @ returns - target_return, "jac": lambda w: returns})
+        
+        if objective == "min_variance" or target_return is not None:
+            def objective_fn(w):
+                return w @ covariance @ w, 2 * covariance @ w
+        else:
+            # Zero-volatility assets (cash, T-bills) play the role of the risk-free leg: the
+            # tangency portfolio is taken over risky assets only, and the Sharpe ratio would
+            # otherwise divide by zero
+            risky = vols > 0
+            if not risky.any():
+                raise ValueError("max_sharpe needs at least one asset with non-zero volatility")
+            bounds = [(0.0, 1.0) if is_risky else (0.0, 0.0) for is_risky in risky]
+            
+            def objective_fn(w):
+                # Negative Sharpe ratio and its gradient, with variance floored away from zero
+                excess = w @ returns - risk_free_rate
+                variance = max(w @ covariance @ w, 1e-18)
+                volatility = math.sqrt(variance)
+                grad = -(returns * volatility - excess * (covariance @ w) / volatility) / variance
+                return -excess / volatility, grad
+        
+        x0 = np.array([upper for _, upper in bounds], dtype=np.float64)
+        x0 /= x0.sum()
+        solution = minimize(
+            objective_fn,
+            x0=x0,
+            jac=True,
+            method="SLSQP",
+            bounds=bounds,
+            constraints=constraints
+        )
+        if not solution.success:
+            raise ValueError(f"Portfolio optimization failed: {solution.message}")
+        
+        # Clip solver noise so weights are non-negative and sum to exactly 1
+        weights = np.clip(solution.x, 0.0, None)
+        weights /= weights.sum()
+        portfolio_return, portfolio_volatility = self._calculate_portfolio_return_arrays(
+            weights, returns, vols, correlation_matrix
+        )
+        # Undefined for a (numerically) riskless portfolio
+        sharpe_ratio = (portfolio_return - risk_free_rate) / portfolio_volatility if portfolio_volatility > 1e-6 else None
+        
+        return FinancialCalculationResult(
+            calculation_type="optimize_portfolio",
+            inputs={
+                "expected_returns": expected_returns,
+                "volatilities": volatilities,
+                "correlations": correlations,
+                "objective": objective,
+                "target_return": target_return,
+                "risk_free_rate": risk_free_rate
+            },
+            result={
+                "allocations": {asset: round(weight * 100, 2) for asset, weight in zip(assets, weights.tolist())},
+                "expected_annual_return": round(portfolio_return * 100, 2),
+                "annual_volatility": round(portfolio_volatility * 100, 2),
+                "sharpe_ratio": round(sharpe_ratio, 2) if sharpe_ratio is not None else None
+            },
+            explanation=f"Optimal allocation targets {portfolio_return*100:.1f}% expected return with {portfolio_volatility*100:.1f}% volatility.",
+            assumptions=[
+                "Long-only, fully invested portfolio",
+                "Zero-volatility assets are excluded from the max-Sharpe (tangency) portfolio",
+                "Expected returns and volatilities are annual",
+                "Assets uncorrelated (unless correlation matrix provided)",
+                "Returns are normally distributed"
+            ]
+        )
+    
     def _calculate_emergency_fund(
         self,
         monthly_expenses: float,
@@ -321,11 +743,13 @@ class FinancialCalculatorTool(ComputationTool):
         
         target_amount = monthly_expenses * months_coverage
         shortfall = target_amount - current_savings
+        coverage_months = _safe_div(current_savings, monthly_expenses)
         
-        if monthly_savings > 0:
-            months_to_target = max(0, shortfall / monthly_savings)
-        else:
-            months_to_target = float('inf') if shortfall > 0 else 0
+        # Without positive savings an outstanding shortfall is never closed
+        months_to_target = max(0, _safe_div(
+            shortfall, max(monthly_savings, 0), math.inf if shortfall > 0 else 0
+        ))
+        reachable = math.isfinite(months_to_target)
         
         return FinancialCalculationResult(
             calculation_type="emergency_fund",
@@ -337,10 +761,10 @@ class FinancialCalculatorTool(ComputationTool):
             },
             result={
                 "target_emergency_fund": round(target_amount, 2),
-                "current_coverage_months": round(current_savings / monthly_expenses, 1) if monthly_expenses > 0 else 0,
+                "current_coverage_months": round(coverage_months, 1),
                 "shortfall": round(max(0, shortfall), 2),
-                "months_to_target": round(months_to_target, 1) if months_to_target != float('inf') else None,
-                "years_to_target": round(months_to_target / 12, 1) if months_to_target != float('inf') else None
+                "months_to_target": round(months_to_target, 1) if reachable else None,
+                "years_to_target": round(months_to_target / 12, 1) if reachable else None
             },
             explanation=f"Target emergency fund: ${target_amount:,.2f} ({months_coverage} months of expenses).",
             assumptions=[
@@ -359,8 +783,8 @@ class FinancialCalculatorTool(ComputationTool):
                 "calculation_type": {
                     "type": "string",
                     "enum": [
-                        "compound_interest", "retirement_savings", "loan_payment",
-                        "portfolio_return", "risk_metrics", "asset_allocation",
+                        "compound_interest", "retirement_savings", "retirement_monte_carlo", "loan_payment",
+                        "loan_payment_sweep", "portfolio_return", "optimize_portfolio", "risk_metrics", "asset_allocation",
                         "emergency_fund", "debt_payoff", "investment_growth", "tax_efficiency"
                     ],
                     "description": "Type of financial calculation to perform"
@@ -1,12 +1,51 @@
 import asyncio
+import copy
+import re
+import threading
 import aiohttp
-from typing import Dict, Any, List, Optional, Union
+from itertools import islice
+from typing import Dict, Any, Hashable, List, Optional, Union
 from urllib.parse import quote_plus
 import json
 
-from app.tools.base import APIBasedTool, ToolResult
+import orjson
+from cachetools import TTLCache
+
+from app.tools.base import APIBasedTool, ToolResult, run_single_flight
 from app.core.config import settings
 
+# Search result cache sizing and freshness per query class (seconds)
+SEARCH_CACHE_SIZE = 1024
+PRICE_CACHE_TTL = 30
+NEWS_CACHE_TTL = 60
+COMPANY_CACHE_TTL = 3600
+
+# Recent results by query class - prices go stale fastest, company info slowest. Shared
+# by every tool instance, since routes create a new tool per request; keys include the engine.
+_price_cache: TTLCache = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=PRICE_CACHE_TTL)
+_news_cache: TTLCache = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=NEWS_CACHE_TTL)
+_company_cache: TTLCache = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=COMPANY_CACHE_TTL)
+_search_cache_lock = threading.Lock()
+
+# Queries matching this are sent to SerpAPI's news vertical
+_FIN_RE = re.compile(r"stock|market|finance|investment", re.IGNORECASE)
+
+# Canned results returned by the mock engine for market queries
+_MOCK_MARKET_RESULTS = (
+    {
+        "title": "Current Market Trends and Analysis",
+        "url": "https://example.com/market-analysis",
+        "snippet": "Today's market shows mixed signals with technology stocks leading gains while energy sector faces challenges...",
+        "source": "Financial News"
+    },
+    {
+        "title": "S&P 500 Index Performance",
+        "url": "https://example.com/sp500",
+        "snippet": "The S&P 500 index has shown resilience this quarter with a 3.2% gain driven by strong earnings reports...",
+        "source": "Market Watch"
+    }
+)
+
 class WebSearchTool(APIBasedTool):
     """
     Web Search Tool for gathering market information and research
@@ -46,10 +85,53 @@ class WebSearchTool(APIBasedTool):
         except Exception as e:
             self.logger.warning(f"Search API test failed: {e}")
     
+    def _get_cache_key(self, normalized_query: str, max_results: int, **kwargs) -> Optional[Hashable]:
+        """Build a cache key for a search, or None if the options aren't hashable"""
+        try:
+            return (self.search_engine, normalized_query, max_results, frozenset(kwargs.items()))
+        except TypeError:
+            return None
+    
+    def _get_cache_for_query(self, normalized_query: str) -> TTLCache:
+        """Pick the result cache whose freshness suits the query"""
+        if "stock" in normalized_query or "price" in normalized_query:
+            return _price_cache
+        if "company" in normalized_query:
+            return _company_cache
+        return _news_cache
+    
+    async def _get_or_fetch(self, cache_key: Hashable, cache: TTLCache, query: str,
+                            max_results: int, **kwargs) -> Dict[str, Any]:
+        """Return cached results, joining an in-flight search for the same key if any"""
+        with _search_cache_lock:
+            cached = cache.get(cache_key)
+        if cached is not None:
+            self.logger.debug(f"Search cache hit for: {query}")
+            return cached
+        
+        async def search_and_cache():
+            results = await self._search_internal(query, max_results, **kwargs)
+            with _search_cache_lock:
+                cache[cache_key] = results
+            return results
+        
+        # Concurrent callers with the same key, from any tool instance, share a single request
+        return await run_single_flight((self.tool_id, cache_key), search_and_cache)
+    
     async def _execute_internal(self, query: str, max_results: int = 5, **kwargs) -> ToolResult:
         """Execute web search"""
         try:
-            results = await self._search_internal(query, max_results, **kwargs)
+            normalized_query = query.lower().strip()
+            cache_key = self._get_cache_key(normalized_query, max_results, **kwargs)
+            cache = self._get_cache_for_query(normalized_query)
+            
+            if cache_key is None:
+                results = await self._search_internal(query, max_results, **kwargs)
+            else:
+                # Callers may mutate the results, so never hand out the shared object
+                results = copy.deepcopy(
+                    await self._get_or_fetch(cache_key, cache, query, max_results, **kwargs)
+                )
             
             return ToolResult(
                 success=True,
@@ -90,14 +172,15 @@ class WebSearchTool(APIBasedTool):
         }
         
         # Add financial/market specific parameters
-        if any(term in query.lower() for term in ["stock", "market", "finance", "investment"]):
+        if _FIN_RE.search(query):
             params["tbm"] = "nws"  # News search for financial queries
         
-        async with self._session.get(self.base_url, params=params) as response:
+        session = await self._get_session()
+        async with session.get(self.base_url, params=params) as response:
             response.raise_for_status()
-            data = await response.json()
+            data = orjson.loads(await response.read())
             
-            return self._format_serpapi_results(data)
+            return self._format_serpapi_results(data, max_results)
     
     async def _google_custom_search(self, query: str, max_results: int, **kwargs) -> Dict[str, Any]:
         """Search using Google Custom Search API"""
@@ -108,9 +191,10 @@ class WebSearchTool(APIBasedTool):
             "num": min(max_results, 10)
         }
         
-        async with self._session.get(self.base_url, params=params) as response:
+        session = await self._get_session()
+        async with session.get(self.base_url, params=params) as response:
             response.raise_for_status()
-            data = await response.json()
+            data = orjson.loads(await response.read())
             
             return self._format_google_results(data)
     
@@ -118,29 +202,19 @@ class WebSearchTool(APIBasedTool):
         """Mock search for development/testing"""
         self.logger.info(f"Mock search for: {query}")
         
-        # Simulate API delay
-        await asyncio.sleep(0.5)
+        # Simulate API delay (off by default so tests and benchmarks aren't throttled)
+        delay = kwargs.get("mock_delay", settings.mock_search_delay)
+        if delay:
+            await asyncio.sleep(delay)
         
         # Generate mock results based on query type
-        if "market" in query.lower() or "stock" in query.lower():
+        lowered_query = query.lower()
+        if "market" in lowered_query or "stock" in lowered_query:
             return {
                 "search_query": query,
-                "results": [
-                    {
-                        "title": "Current Market Trends and Analysis",
-                        "url": "https://example.com/market-analysis",
-                        "snippet": "Today's market shows mixed signals with technology stocks leading gains while energy sector faces challenges...",
-                        "source": "Financial News"
-                    },
-                    {
-                        "title": "S&P 500 Index Performance",
-                        "url": "https://example.com/sp500",
-                        "snippet": "The S&P 500 index has shown resilience this quarter with a 3.2% gain driven by strong earnings reports...",
-                        "source": "Market Watch"
-                    }
-                ],
+                "results": [dict(item) for item in _MOCK_MARKET_RESULTS],
                 "total_results": max_results,
-                "search_time": 0.5,
+                "search_time": delay,
                 "mock_data": True
             }
         else:
@@ -155,16 +229,16 @@ class WebSearchTool(APIBasedTool):
                     }
                 ],
                 "total_results": max_results,
-                "search_time": 0.5,
+                "search_time": delay,
                 "mock_data": True
             }
     
-    def _format_serpapi_results(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Format SerpAPI results"""
+    def _format_serpapi_results(self, data: Dict[str, Any], max_results: Optional[int] = None) -> Dict[str, Any]:
+        """Format SerpAPI results, keeping at most max_results entries"""
         results = []
         
         # Handle organic results
-        for item in data.get("organic_results", []):
+        for item in islice(data.get("organic_results", []), max_results):
             results.append({
                 "title": item.get("title", ""),
                 "url": item.get("link", ""),
@@ -173,7 +247,8 @@ class WebSearchTool(APIBasedTool):
             })
         
         # Handle news results for financial queries
-        for item in data.get("news_results", []):
+        remaining = None if max_results is None else max_results - len(results)
+        for item in islice(data.get("news_results", []), remaining):
             results.append({
                 "title": item.get("title", ""),
                 "url": item.get("link", ""),
@@ -251,6 +326,12 @@ class WebSearchTool(APIBasedTool):
             }
         }
     
+    async def search_many(self, queries: List[str], max_results: int = 5) -> List[ToolResult]:
+        """Run several searches concurrently, overlapping their network latency"""
+        return await asyncio.gather(
+            *(self.execute_async(query=query, max_results=max_results) for query in queries)
+        )
+    
     async def search_financial_news(self, query: str, max_results: int = 5) -> ToolResult:
         """Specialized method for financial news search"""
         financial_query = f"{query} finance market news"
@@ -0,0 +1,5 @@
+import sys
+
+# Keyword arguments enabling __slots__ on dataclasses (Python 3.10+); on older
+# interpreters dataclasses fall back to a regular instance __dict__
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
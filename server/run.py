@@ -8,10 +8,20 @@ import uvicorn
 from app.core.config import settings
 
 if __name__ == "__main__":
+    # Reload mode needs a single process; extra workers are opt-in since per-process
+    # state (in-memory caches, a generated SECRET_KEY) isn't shared between them
+    workers = 1 if settings.debug else (settings.api_workers or 1)
+    
+    if workers > 1:
+        # Create the schema once here so workers don't race to create the same tables
+        from app.core.database import create_tables
+        create_tables()
+    
     print("🚀 Starting CoAgentics AI System...")
     print(f"📊 Environment: {settings.environment}")
     print(f"🌐 Host: {settings.api_host}:{settings.api_port}")
     print(f"📖 Docs: http://{settings.api_host}:{settings.api_port}/docs")
+    print(f"👷 Workers: {workers}")
     print("=" * 50)
     
     uvicorn.run(
@@ -19,5 +29,8 @@ if __name__ == "__main__":
         host=settings.api_host,
         port=settings.api_port,
         reload=settings.debug,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
         log_level="info" if settings.debug else "warning"
     ) 
\ No newline at end of file